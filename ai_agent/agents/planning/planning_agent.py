@@ -168,7 +168,9 @@ class PlanningAgent(BaseAgent):
 
     async def _decompose_task(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Decompose a task into subtasks."""
-        parent_task = PlannedTask(**parameters["task"])
+        task = parameters["task"]
+        # Accept an already-built task as well as its dict form
+        parent_task = task if isinstance(task, PlannedTask) else PlannedTask(**task)
 
         # Analyze task complexity and requirements
         complexity_score = await self._analyze_task_complexity(parent_task)
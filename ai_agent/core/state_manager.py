@@ -13,6 +13,9 @@ from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Number of keys requested per SCAN/MGET round trip
+SCAN_BATCH_SIZE = 500
+
 
 class StateEntry(BaseModel):
     """State entry with metadata."""
@@ -73,11 +76,7 @@ class StateManager:
 
             # Persist if not temporary
             if not temporary:
-                await self.redis.set(
-                    f"state:{key}",
-                    entry.json(),
-                    ex=None if not temporary else 3600,  # 1 hour for temporary
-                )
+                await self.redis.set(f"state:{key}", entry.json())
 
             # Notify subscribers
             await self._notify_subscribers(key, entry)
@@ -170,30 +169,48 @@ class StateManager:
     async def sync_cache(self):
         """Synchronize cache with Redis."""
         try:
-            # Get all keys
-            keys = await self.redis.keys("state:*")
-
             # Clear current cache
             self.local_cache.clear()
 
-            # Rebuild cache
-            for key in keys:
-                value = await self.redis.get(key)
-                if value:
-                    entry = StateEntry.parse_raw(value)
-                    stripped_key = key.decode().replace("state:", "")
-                    self.local_cache[stripped_key] = entry
-
-            logger.debug(f"Synchronized cache with {len(keys)} entries")
+            # Rebuild cache in batches; SCAN doesn't block Redis like KEYS does
+            count = 0
+            batch = []
+            async for key in self.redis.scan_iter(
+                match="state:*", count=SCAN_BATCH_SIZE
+            ):
+                batch.append(key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    count += await self._load_cache_batch(batch)
+                    batch = []
+            if batch:
+                count += await self._load_cache_batch(batch)
+
+            logger.debug(f"Synchronized cache with {count} entries")
 
         except Exception as e:
             logger.error(f"Failed to sync cache: {e}")
 
+    async def _load_cache_batch(self, keys: List[bytes]) -> int:
+        """Load a batch of Redis state keys into the local cache."""
+        values = await self.redis.mget(keys)
+        for key, value in zip(keys, values):
+            if value:
+                entry = StateEntry.parse_raw(value)
+                stripped_key = key.decode().replace("state:", "")
+                self.local_cache[stripped_key] = entry
+        return len(keys)
+
     async def get_all_keys(self) -> List[str]:
         """Get all state keys."""
         try:
-            keys = await self.redis.keys("state:*")
-            return [key.decode().replace("state:", "") for key in keys]
+            keys = [
+                key.decode().replace("state:", "")
+                async for key in self.redis.scan_iter(
+                    match="state:*", count=SCAN_BATCH_SIZE
+                )
+            ]
+            # SCAN may return a key more than once; keep the first occurrence
+            return list(dict.fromkeys(keys))
         except Exception as e:
             logger.error(f"Failed to get state keys: {e}")
             return []
@@ -217,6 +234,7 @@ class StateManager:
         """
         try:
             pipe = await self.redis.pipeline()
+            entries = []
 
             for key, value in states.items():
                 # Increment version
@@ -237,16 +255,18 @@ class StateManager:
 
                 # Add to pipeline
                 if not temporary:
-                    await pipe.set(
-                        f"state:{key}", entry.json(), ex=None if not temporary else 3600
-                    )
+                    await pipe.set(f"state:{key}", entry.json())
 
-                # Notify subscribers
-                await self._notify_subscribers(key, entry)
+                entries.append((key, entry))
 
             # Execute pipeline
             await pipe.execute()
 
+            # Notify subscribers for all keys concurrently
+            await asyncio.gather(
+                *(self._notify_subscribers(key, entry) for key, entry in entries)
+            )
+
             logger.debug(f"Bulk set {len(states)} states")
             return True
 
@@ -6,7 +6,8 @@ Handles task creation, assignment, and lifecycle management.
 import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import cached_property
+from typing import Dict, List, Optional, Set
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
@@ -58,6 +59,11 @@ class Task(BaseModel):
     parent_task: Optional[UUID] = None
     subtasks: List[UUID] = Field(default_factory=list)
 
+    @cached_property
+    def id_str(self) -> str:
+        """Task ID as a string, cached for message payloads."""
+        return str(self.id)
+
 
 class TaskManager:
     """Manages task lifecycle and distribution."""
@@ -68,6 +74,9 @@ class TaskManager:
         self.agent_manager = agent_manager
         self.tasks: Dict[UUID, Task] = {}
         self.task_queue: List[UUID] = []
+        # Tasks still awaiting assignment; task_queue entries not in here are
+        # stale and are compacted away by the scheduler
+        self._queued: Set[UUID] = set()
 
     async def create_task(
         self,
@@ -100,6 +109,7 @@ class TaskManager:
 
         self.tasks[task.id] = task
         self.task_queue.append(task.id)
+        self._queued.add(task.id)
 
         # Sort queue by priority
         self.task_queue.sort(key=lambda x: self.tasks[x].priority.level, reverse=True)
@@ -122,7 +132,7 @@ class TaskManager:
         Returns:
             bool: True if assignment successful
         """
-        if task_id not in self.tasks or task_id not in self.task_queue:
+        if task_id not in self.tasks or task_id not in self._queued:
             return False
 
         task = self.tasks[task_id]
@@ -131,7 +141,7 @@ class TaskManager:
         task.started_at = datetime.utcnow()
 
         # Remove from queue
-        self.task_queue.remove(task_id)
+        self._queued.discard(task_id)
 
         # Notify agent
         await self.message_bus.publish(
@@ -140,7 +150,7 @@ class TaskManager:
                 type="task_assigned",
                 sender=UUID(int=0),  # System ID
                 receiver=agent_id,
-                content={"task_id": str(task_id)},
+                content={"task_id": task.id_str},
             ),
         )
 
@@ -193,10 +203,16 @@ class TaskManager:
 
     async def _process_task_queue(self):
         """Process pending tasks in queue."""
+        # Drop entries that were assigned or cancelled since the last pass
+        self.task_queue = [
+            task_id for task_id in self.task_queue if task_id in self._queued
+        ]
         if not self.task_queue:
             return
 
         for task_id in self.task_queue[:]:  # Copy list for iteration
+            if task_id not in self._queued:
+                continue
             task = self.tasks[task_id]
 
             # Find suitable agent
@@ -278,30 +294,34 @@ class TaskManager:
         if task_id not in self.tasks:
             return False
 
-        task = self.tasks[task_id]
+        # Walk the subtask tree iteratively so deep trees can't hit the
+        # recursion limit
+        stack = [task_id]
+        while stack:
+            current_id = stack.pop()
+            task = self.tasks.get(current_id)
+            if not task:
+                continue
+            stack.extend(task.subtasks)
+
+            # Remove from queue if pending
+            self._queued.discard(current_id)
+
+            # Notify agent if assigned
+            if task.agent_id:
+                await self.message_bus.publish(
+                    f"agent.{task.agent_id}",
+                    Message(
+                        type="task_cancelled",
+                        sender=UUID(int=0),  # System ID
+                        receiver=task.agent_id,
+                        content={"task_id": task.id_str},
+                    ),
+                )
 
-        # Cancel subtasks first
-        for subtask_id in task.subtasks:
-            await self.cancel_task(subtask_id)
-
-        # Remove from queue if pending
-        if task_id in self.task_queue:
-            self.task_queue.remove(task_id)
-
-        # Notify agent if assigned
-        if task.agent_id:
-            await self.message_bus.publish(
-                f"agent.{task.agent_id}",
-                Message(
-                    type="task_cancelled",
-                    sender=UUID(int=0),  # System ID
-                    receiver=task.agent_id,
-                    content={"task_id": str(task_id)},
-                ),
-            )
+            task.status = "cancelled"
+            logger.info(f"Cancelled task {current_id}")
 
-        task.status = "cancelled"
-        logger.info(f"Cancelled task {task_id}")
         return True
 
     async def get_task_status(self, task_id: UUID) -> Optional[str]:
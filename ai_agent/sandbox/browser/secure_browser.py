@@ -3,29 +3,53 @@ Secure browser implementation with anti-detection measures.
 """
 
 import asyncio
-import json
 import logging
 import random
-import time
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 from fake_useragent import UserAgent
-from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver import Chrome, ChromeOptions
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
 
 logger = logging.getLogger(__name__)
 
+# Loading the user agent database is expensive, so share one instance
+_UA = UserAgent()
+
+# Navigator property overrides injected into every document
+_ANTI_DETECTION_JS = """
+Object.defineProperty(navigator, 'webdriver', {
+    get: () => undefined
+});
+
+Object.defineProperty(navigator, 'languages', {
+    get: () => ['en-US', 'en']
+});
+
+Object.defineProperty(navigator, 'plugins', {
+    get: () => [
+        {
+            0: {type: "application/x-google-chrome-pdf"},
+            description: "Portable Document Format",
+            filename: "internal-pdf-viewer",
+            length: 1,
+            name: "Chrome PDF Plugin"
+        }
+    ]
+});
+"""
+
 
 class BrowserConfig:
     """Browser configuration with anti-detection measures."""
 
     def __init__(self):
-        self.user_agent = UserAgent()
+        self.user_agent = _UA
         self._load_profiles()
 
     def _load_profiles(self):
@@ -42,38 +66,40 @@ class BrowserConfig:
             }
         }
 
-    def get_chrome_options(self, profile: str = "default") -> ChromeOptions:
-        """Get Chrome options with anti-detection measures."""
-        options = ChromeOptions()
+    def get_launch_options(self, profile: str = "default") -> Dict[str, Any]:
+        """Get Chromium launch options with anti-detection measures."""
         profile_data = self.profiles[profile]
 
-        # Basic settings
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument(
-            f'--window-size={profile_data["window_size"][0]},{profile_data["window_size"][1]}'
-        )
+        return {
+            # Run headed (under Xvfb) so bot blockers don't flag headless Chrome
+            "headless": False,
+            "args": [
+                # Basic settings
+                "--no-sandbox",
+                "--disable-dev-shm-usage",
+                "--disable-gpu",
+                f'--window-size={profile_data["window_size"][0]},'
+                f'{profile_data["window_size"][1]}',
+                # Anti-detection settings
+                "--disable-blink-features=AutomationControlled",
+            ],
+            "ignore_default_args": ["--enable-automation"],
+        }
 
-        # Anti-detection settings
-        options.add_argument(f"--user-agent={self.user_agent.random}")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option("useAutomationExtension", False)
-
-        # Additional preferences
-        options.add_experimental_option(
-            "prefs",
-            {
-                "intl.accept_languages": profile_data["languages"],
-                "profile.default_content_setting_values.notifications": 2,
-                "profile.default_content_setting_values.geolocation": 2,
-                "profile.managed_default_content_settings.images": 1,
-                "profile.default_content_setting_values.cookies": 1,
+    def get_context_options(self, profile: str = "default") -> Dict[str, Any]:
+        """Get browser context options for the given profile."""
+        profile_data = self.profiles[profile]
+        width, height = profile_data["viewport_size"]
+
+        return {
+            "user_agent": self.user_agent.random,
+            "viewport": {"width": width, "height": height},
+            "locale": profile_data["languages"][0],
+            "timezone_id": profile_data["timezone"],
+            "extra_http_headers": {
+                "Accept-Language": ",".join(profile_data["languages"])
             },
-        )
-
-        return options
+        }
 
 
 class SecureBrowser:
@@ -82,48 +108,35 @@ class SecureBrowser:
     def __init__(self):
         """Initialize secure browser."""
         self.config = BrowserConfig()
-        self.browser: Optional[Chrome] = None
+        self._playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
         self._setup_complete = False
 
     async def setup(self):
         """Set up browser instance."""
         if not self._setup_complete:
-            options = self.config.get_chrome_options()
-            self.browser = Chrome(options=options)
+            self._playwright = await async_playwright().start()
+            self.browser = await self._playwright.chromium.launch(
+                **self.config.get_launch_options()
+            )
+            self.context = await self.browser.new_context(
+                **self.config.get_context_options()
+            )
 
-            # Execute anti-detection scripts
+            # Register anti-detection scripts before the first page is opened
             await self._setup_anti_detection()
+            self.page = await self.context.new_page()
             self._setup_complete = True
 
     async def _setup_anti_detection(self):
         """Set up additional anti-detection measures."""
-        if not self.browser:
+        if not self.context:
             return
 
-        # Override navigator properties
-        script = """
-        Object.defineProperty(navigator, 'webdriver', {
-            get: () => undefined
-        });
-        
-        Object.defineProperty(navigator, 'languages', {
-            get: () => ['en-US', 'en']
-        });
-        
-        Object.defineProperty(navigator, 'plugins', {
-            get: () => [
-                {
-                    0: {type: "application/x-google-chrome-pdf"},
-                    description: "Portable Document Format",
-                    filename: "internal-pdf-viewer",
-                    length: 1,
-                    name: "Chrome PDF Plugin"
-                }
-            ]
-        });
-        """
-
-        self.browser.execute_script(script)
+        # Runs in every new document of the context, not just the current one
+        await self.context.add_init_script(_ANTI_DETECTION_JS)
 
     async def browse(
         self, url: str, timeout: int = 30, wait_for: Optional[str] = None
@@ -146,26 +159,20 @@ class SecureBrowser:
             # Add random delay
             await asyncio.sleep(random.uniform(1, 3))
 
-            # Navigate with retry logic
+            # Navigate with retry logic, waiting for the page load event
             for attempt in range(3):
                 try:
-                    self.browser.get(url)
+                    await self.page.goto(url, timeout=timeout * 1000)
                     break
-                except Exception as e:
+                except Exception:
                     if attempt == 2:
                         raise
                     await asyncio.sleep(random.uniform(2, 5))
 
             # Wait for content
             if wait_for:
-                WebDriverWait(self.browser, timeout).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, wait_for))
-                )
-            else:
-                # Wait for page load
-                WebDriverWait(self.browser, timeout).until(
-                    lambda driver: driver.execute_script("return document.readyState")
-                    == "complete"
+                await self.page.wait_for_selector(
+                    wait_for, state="attached", timeout=timeout * 1000
                 )
 
             # Add random scroll behavior
@@ -175,8 +182,8 @@ class SecureBrowser:
             content = await self._extract_content()
 
             return {
-                "url": self.browser.current_url,
-                "title": self.browser.title,
+                "url": self.page.url,
+                "title": await self.page.title(),
                 "content": content,
                 "success": True,
             }
@@ -187,11 +194,11 @@ class SecureBrowser:
 
     async def _random_scroll(self):
         """Perform random scrolling behavior."""
-        if not self.browser:
+        if not self.page:
             return
 
         # Get page height
-        height = self.browser.execute_script("return document.body.scrollHeight")
+        height = await self.page.evaluate("document.body.scrollHeight")
 
         # Random scroll positions
         positions = sorted(
@@ -200,56 +207,48 @@ class SecureBrowser:
 
         # Scroll with random delays
         for position in positions:
-            self.browser.execute_script(f"window.scrollTo(0, {position})")
+            await self.page.evaluate("(y) => window.scrollTo(0, y)", position)
             await asyncio.sleep(random.uniform(0.5, 2))
 
     async def _extract_content(self) -> Dict[str, Any]:
         """Extract content from current page."""
-        if not self.browser:
+        if not self.page:
             return {}
 
-        # Basic content extraction
-        content = {
-            "text": self.browser.find_element(By.TAG_NAME, "body").text,
-            "links": [
-                {"text": el.text, "href": el.get_attribute("href")}
-                for el in self.browser.find_elements(By.TAG_NAME, "a")
-                if el.get_attribute("href")
-            ],
-            "metadata": {
-                "title": self.browser.title,
-                "meta_description": "",
-                "meta_keywords": "",
-            },
-        }
-
-        # Extract metadata
-        try:
-            meta_desc = self.browser.find_element(
-                By.CSS_SELECTOR, 'meta[name="description"]'
-            )
-            content["metadata"]["meta_description"] = meta_desc.get_attribute("content")
-        except:
-            pass
-
-        try:
-            meta_keywords = self.browser.find_element(
-                By.CSS_SELECTOR, 'meta[name="keywords"]'
-            )
-            content["metadata"]["meta_keywords"] = meta_keywords.get_attribute(
-                "content"
-            )
-        except:
-            pass
-
-        return content
+        # Gather text, links and metadata in a single evaluation round trip
+        return await self.page.evaluate(
+            """
+            () => {
+                const meta = (name) => {
+                    const el = document.querySelector(`meta[name="${name}"]`);
+                    return el ? el.getAttribute("content") : "";
+                };
+                return {
+                    text: document.body ? document.body.innerText : "",
+                    links: Array.from(document.querySelectorAll("a"))
+                        .filter((el) => el.href)
+                        .map((el) => ({text: el.innerText, href: el.href})),
+                    metadata: {
+                        title: document.title,
+                        meta_description: meta("description"),
+                        meta_keywords: meta("keywords"),
+                    },
+                };
+            }
+            """
+        )
 
     async def close(self):
         """Close browser instance."""
         if self.browser:
-            self.browser.quit()
+            await self.browser.close()
             self.browser = None
-            self._setup_complete = False
+            self.context = None
+            self.page = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        self._setup_complete = False
 
     async def __aenter__(self):
         """Context manager entry."""
@@ -16,16 +16,31 @@ using the `pathspec` library.
 - Displays the tree structure on the command line.
 """
 import argparse
+import codecs
+import functools
 import glob
+import io
+import json
 import logging
 import os
+import re
 import subprocess
 import sys
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import BinaryIO, Iterator, List, Optional, Pattern, Set, Tuple
 
 import pathspec
+from pathspec.util import normalize_file
+
+ROOT_CACHE_FILE = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "export_code"
+    / "root.json"
+)
 
 
 def setup_logging(debug: bool = False) -> logging.Logger:
@@ -49,12 +64,154 @@ def load_gitignore_patterns(gitignore_path: Path) -> List[str]:
     return patterns
 
 
+def gitignore_mtime(git_root: Path) -> Optional[int]:
+    """Return the .gitignore modification time, or None if there isn't one."""
+    try:
+        return (git_root / ".gitignore").stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_cached_root(cwd: str) -> Optional[Tuple[Path, List[str]]]:
+    """
+    Look up the Git root and .gitignore patterns cached for a directory.
+
+    The entry is only used while the repository still exists and its
+    .gitignore hasn't been modified since it was cached.
+    """
+    try:
+        with ROOT_CACHE_FILE.open("r", encoding="utf-8") as f:
+            entry = json.load(f)[cwd]
+        git_root = Path(entry["git_root"])
+        mtime = entry.get("gitignore_mtime")
+        patterns = entry["patterns"]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None  # A missing or malformed entry is a cache miss
+    if not isinstance(patterns, list):
+        return None
+    if not (git_root / ".git").exists():
+        return None
+    if gitignore_mtime(git_root) != mtime:
+        return None
+    return git_root, patterns
+
+
+def save_cached_root(cwd: str, git_root: Path, patterns: List[str]) -> None:
+    """Cache the Git root and .gitignore patterns for a directory."""
+    try:
+        with ROOT_CACHE_FILE.open("r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if not isinstance(cache, dict):
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    cache[cwd] = {
+        "git_root": os.fspath(git_root),
+        "gitignore_mtime": gitignore_mtime(git_root),
+        "patterns": patterns,
+    }
+    try:
+        ROOT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # Replace the file atomically so concurrent runs never read half of it
+        tmp_file = ROOT_CACHE_FILE.with_name(f"{ROOT_CACHE_FILE.name}.{os.getpid()}")
+        with tmp_file.open("w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, ROOT_CACHE_FILE)
+    except OSError:
+        pass  # The cache is only an optimization
+
+
+class CachedSpec:
+    """
+    Wrap a PathSpec with a combined-regex fast path and a directory cache.
+
+    Ignore patterns and negations are each combined into one alternation.
+    Most paths in a tree match no ignore pattern and are kept after a single
+    regex search, and most of the rest match no negation and are ignored
+    after a second. Only paths hit by both go through pathspec's ordered
+    matching. Directory decisions are cached since the same directories are
+    checked again when walked roots overlap.
+    """
+
+    def __init__(self, spec: pathspec.PathSpec, max_dirs: int = 10000):
+        self.spec = spec
+        self.max_dirs = max_dirs
+        self._dir_cache: "OrderedDict[str, bool]" = OrderedDict()
+        self._dir_lock = threading.Lock()
+        self._include = self._combine_patterns(spec, include=True)
+        self._exclude = self._combine_patterns(spec, include=False)
+        # Without negations only the include alternation matters; if either
+        # alternation failed to build, pathspec decides every path
+        self._fast = self._include is not None and (
+            self._exclude is not None
+            or not any(pattern.include is False for pattern in spec.patterns)
+        )
+
+    @staticmethod
+    def _combine_patterns(
+        spec: pathspec.PathSpec, include: bool
+    ) -> Optional[Pattern[str]]:
+        """Build a single regex matching any ignore (or negation) pattern."""
+        regexes = [
+            # Named groups can't repeat across alternatives, so drop the names
+            re.sub(r"\(\?P<\w+>", "(?:", pattern.regex.pattern)
+            for pattern in spec.patterns
+            if pattern.include is include and pattern.regex is not None
+        ]
+        if not regexes:
+            return None
+        try:
+            return re.compile("|".join(f"(?:{regex})" for regex in regexes))
+        except re.error:
+            return None
+
+    def match_file(self, file_path: str) -> bool:
+        """
+        Check whether a path, relative to the cwd, is ignored.
+
+        A path no ignore pattern matches is kept, and one no negation matches
+        is ignored. Only paths hit by both depend on pattern order, so just
+        those go through pathspec.
+        """
+        if not self._fast:
+            return self.spec.match_file(file_path)
+        normalized = normalize_file(file_path)
+        if not self._include.search(normalized):
+            return False
+        if self._exclude is None or not self._exclude.search(normalized):
+            return True
+        return self.spec.match_file(file_path)
+
+    def match_dir(self, dir_path: str) -> bool:
+        """Check whether a directory, relative to the cwd, is ignored."""
+        with self._dir_lock:
+            cached = self._dir_cache.get(dir_path)
+            if cached is not None:
+                self._dir_cache.move_to_end(dir_path)
+                return cached
+        # The trailing slash lets directory-only patterns such as "build/" match
+        ignored = self.match_file(f"{dir_path}/")
+        with self._dir_lock:
+            self._dir_cache[dir_path] = ignored
+            if len(self._dir_cache) > self.max_dirs:
+                self._dir_cache.popitem(last=False)
+        return ignored
+
+
 def compile_ignore_spec(
     gitignore_patterns: List[str], cli_ignore_patterns: List[str]
-) -> pathspec.PathSpec:
+) -> CachedSpec:
     """Compile ignore patterns using pathspec."""
     combined_patterns = gitignore_patterns + cli_ignore_patterns
-    return pathspec.PathSpec.from_lines("gitwildmatch", combined_patterns)
+    try:
+        # The simple backend is safe to share between the walker threads
+        spec = pathspec.PathSpec.from_lines(
+            "gitwildmatch", combined_patterns, backend="simple"
+        )
+    except TypeError:
+        # pathspec < 1.0 has no backend argument and only the simple matcher
+        spec = pathspec.PathSpec.from_lines("gitwildmatch", combined_patterns)
+    return CachedSpec(spec)
 
 
 def expand_globs(patterns: List[str]) -> List[Path]:
@@ -66,53 +223,176 @@ def expand_globs(patterns: List[str]) -> List[Path]:
             matched = glob.glob(pattern, recursive=True)
         else:
             matched = glob.glob(pattern)
-        expanded.extend([Path(p).resolve() for p in matched if Path(p).exists()])
+        # glob only returns existing entries, and abspath makes them absolute
+        # without the per-component readlink calls of resolve()
+        expanded.extend(Path(os.path.abspath(p)) for p in matched)
     return expanded
 
 
+def is_ignored_dir(
+    relative_dir: str,
+    spec: CachedSpec,
+    data_dir: str,
+    logger: logging.Logger,
+) -> bool:
+    """Check whether a directory, relative to the cwd, should be skipped."""
+    if relative_dir == data_dir or os.path.basename(relative_dir) == ".git":
+        logger.debug(f"Skipping directory: {relative_dir}")
+        return True
+    if spec.match_dir(relative_dir):
+        logger.debug(f"Skipping ignored directory: {relative_dir}")
+        return True
+    return False
+
+
+def filter_dirnames(
+    root_prefix: str,
+    dirnames: List[str],
+    spec: CachedSpec,
+    cwd_prefix: str,
+    data_dir: str,
+    logger: logging.Logger,
+) -> List[str]:
+    """
+    Drop ignored subdirectories from a directory listing. root_prefix is the
+    listed directory with a trailing separator.
+    """
+    if not root_prefix.startswith(cwd_prefix):
+        return dirnames
+    relative_root = root_prefix[len(cwd_prefix) :]
+    return [
+        d
+        for d in dirnames
+        if not is_ignored_dir(relative_root + d, spec, data_dir, logger)
+    ]
+
+
+def walk_directory(
+    dir_path: Path,
+    spec: CachedSpec,
+    cwd_prefix: str,
+    data_dir: str,
+    logger: logging.Logger,
+    recursive: bool = True,
+) -> Set[Tuple[str, Optional[str]]]:
+    """
+    Collect the non-ignored, non-binary files under a directory, as
+    (absolute path, cwd-relative path) pairs. With recursive=False only the
+    files directly inside it are considered.
+    """
+    collected: Set[Tuple[str, Optional[str]]] = set()
+    cwd_len = len(cwd_prefix)
+    data_prefix = data_dir + os.sep
+    # Directories are kept with a trailing separator so child paths are
+    # plain concatenations rather than os.path.join calls
+    stack = [os.path.join(dir_path, "")]
+    while stack:
+        root_prefix = stack.pop()
+        dirnames = []
+        filenames = []
+        try:
+            with os.scandir(root_prefix) as entries:
+                for entry in entries:
+                    # DirEntry caches the type from the directory listing, so
+                    # sorting entries costs no extra stat. Like os.walk,
+                    # symlinked directories are neither files nor descended.
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        filenames.append(entry.name)
+                    elif recursive and not entry.is_symlink():
+                        dirnames.append(entry.name)
+        except OSError:
+            continue  # Unreadable directories are skipped, as os.walk does
+
+        # Prune ignored subdirectories before they are ever listed
+        for d in filter_dirnames(
+            root_prefix, dirnames, spec, cwd_prefix, data_dir, logger
+        ):
+            stack.append(root_prefix + d + os.sep)
+
+        if root_prefix.startswith(cwd_prefix):
+            relative_root = root_prefix[cwd_len:]
+        else:
+            relative_root = None
+        for filename in filenames:
+            file_str = root_prefix + filename
+            if relative_root is None:
+                # If file is not under current working directory, skip
+                logger.warning(
+                    f"File {file_str} is not under the current working directory."
+                )
+                continue
+            relative_path = relative_root + filename
+            # Skip files in data directory
+            if relative_path.startswith(data_prefix):
+                logger.debug(f"Skipping file in data directory: {relative_path}")
+                continue
+
+            if not spec.match_file(relative_path):
+                if not is_binary_file(file_str):
+                    collected.add((file_str, relative_path))
+                else:
+                    logger.debug(f"Skipping binary file: {relative_path}")
+    return collected
+
+
 def collect_files(
     dirs: List[Path],
     files: List[Path],
-    spec: pathspec.PathSpec,
+    spec: CachedSpec,
     logger: logging.Logger,
-) -> List[Path]:
+) -> List[Tuple[str, Optional[str]]]:
     """
     Collect files from directories and specific files, applying ignore
     patterns and skipping binary files.
+
+    Returns (absolute path, cwd-relative path) pairs, where the relative
+    path is None for files outside the cwd.
     """
-    collected = set()
+    # Plain strings hash and compare faster than Path objects
+    collected: Set[Tuple[str, Optional[str]]] = set()
+    # Relative paths are sliced off this prefix instead of using relative_to
+    cwd_prefix = os.path.join(os.getcwd(), "")
 
     # Add data/ directory to ignored paths
-    data_dir = Path("data")
+    data_dir = "data"
 
-    # Process directories
+    # Split each directory into its own files plus one job per top-level
+    # subdirectory, so independent subtrees are walked in parallel
+    work = []
     for dir_path in dirs:
         if not dir_path.is_dir():
             logger.warning(f"Specified path is not a directory: {dir_path}")
             continue
-        for root, _, filenames in os.walk(dir_path):
-            root_path = Path(root).resolve()
-            for filename in filenames:
-                file_path = root_path / filename
-                try:
-                    relative_path = file_path.relative_to(Path.cwd())
-                except ValueError:
-                    # If file is not under current working directory, skip
-                    logger.warning(
-                        f"File {file_path} is not under the current working "
-                        "directory."
-                    )
-                    continue
-                # Skip files in data directory
-                if data_dir in file_path.parents:
-                    logger.debug(f"Skipping file in data directory: {relative_path}")
-                    continue
-
-                if not spec.match_file(str(relative_path)):
-                    if not is_binary_file(file_path):
-                        collected.add(file_path)
-                    else:
-                        logger.debug(f"Skipping binary file: {relative_path}")
+        try:
+            with os.scandir(dir_path) as entries:
+                subdirs = [e.name for e in entries if e.is_dir(follow_symlinks=False)]
+        except OSError as e:
+            # Unreadable directories are skipped, as os.walk does
+            logger.debug(f"Skipping unreadable directory {dir_path}: {e}")
+            continue
+        work.append((dir_path, False))
+        work.extend(
+            (dir_path / d, True)
+            for d in filter_dirnames(
+                os.path.join(dir_path, ""), subdirs, spec, cwd_prefix, data_dir, logger
+            )
+        )
+
+    # Process directories
+    max_workers = min(16, (os.cpu_count() or 1) * 2)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                walk_directory, path, spec, cwd_prefix, data_dir, logger, recursive
+            )
+            for path, recursive in work
+        ]
+        for future in futures:
+            collected |= future.result()
 
     # Process specific files
     for file_path in files:
@@ -122,65 +402,211 @@ def collect_files(
                 f"{file_path}"
             )
             continue
-        try:
-            relative_path = file_path.relative_to(Path.cwd())
-        except ValueError:
-            relative_path = file_path
+        file_str = os.fspath(file_path)
+        if file_str.startswith(cwd_prefix):
+            relative_path = file_str[len(cwd_prefix) :]
+            cwd_relative_path = relative_path
+        else:
+            relative_path = file_str
+            cwd_relative_path = None
         # Skip files in data directory
-        if data_dir in file_path.parents:
+        if relative_path.startswith(data_dir + os.sep):
             logger.debug(f"Skipping file in data directory: {relative_path}")
             continue
 
-        if not spec.match_file(str(relative_path)):
-            if not is_binary_file(file_path):
-                collected.add(file_path.resolve())
+        if not spec.match_file(relative_path):
+            if not is_binary_file(file_str):
+                collected.add((file_str, cwd_relative_path))
             else:
                 logger.debug(f"Skipping binary file: {relative_path}")
 
-    return sorted(collected)
+    # Sort by components, the order Path objects sort in
+    return sorted(collected, key=lambda f: os.path.normcase(f[0]).split(os.sep))
 
 
-def build_tree(paths: List[Path], root: Path) -> Dict:
-    """Build a nested dictionary representing the tree structure."""
-    tree = {".": {}}
-    for path in paths:
-        try:
-            relative_path = path.relative_to(root)
-        except ValueError:
-            # If path is not relative to root, skip it
-            continue
-        parts = relative_path.parts
-        current_level = tree["."]
-        for part in parts[:-1]:
-            current_level = current_level.setdefault(part, {})
-        current_level[parts[-1]] = None  # Files are leaves
-    return tree
+def render_tree(relative_paths: List[str]) -> str:
+    """
+    Generate a string representation of the tree of cwd-relative paths.
 
+    Sorting the paths by their components gives the same order as sorting
+    the entries of every directory, so the tree is rendered in one pass
+    without building nested dictionaries.
+    """
+    relative_parts = sorted(tuple(path.split(os.sep)) for path in relative_paths)
+
+    # Flatten into (depth, name, is_dir) nodes in display order
+    nodes = [(0, ".", True)]
+    prev_parts = ()
+    for parts in relative_parts:
+        common = 0
+        for prev, part in zip(prev_parts[:-1], parts[:-1]):
+            if prev != part:
+                break
+            common += 1
+        for depth in range(common, len(parts) - 1):
+            nodes.append((depth + 1, parts[depth], True))
+        nodes.append((len(parts), parts[-1], False))
+        prev_parts = parts
+
+    # A node is the last child of its parent if no later sibling follows it
+    is_last = [False] * len(nodes)
+    has_next: List[bool] = []
+    for idx in range(len(nodes) - 1, -1, -1):
+        depth = nodes[idx][0]
+        del has_next[depth + 1 :]
+        if len(has_next) <= depth:
+            has_next.extend([False] * (depth + 1 - len(has_next)))
+        is_last[idx] = not has_next[depth]
+        has_next[depth] = True
 
-def print_tree(tree: Dict, prefix: str = "") -> str:
-    """Generate a string representation of the tree structure."""
     lines = []
-    entries = sorted(tree.keys())
-    for idx, key in enumerate(entries):
-        connector = "└── " if idx == len(entries) - 1 else "├── "
-        lines.append(f"{prefix}{connector}{key}")
-        if isinstance(tree[key], dict):
-            extension = "    " if idx == len(entries) - 1 else "│   "
-            lines.append(print_tree(tree[key], prefix + extension))
+    prefixes = [""]
+    for (depth, name, is_dir), last in zip(nodes, is_last):
+        prefix = prefixes[depth]
+        connector = "└── " if last else "├── "
+        lines.append(f"{prefix}{connector}{name}")
+        if is_dir:
+            del prefixes[depth + 1 :]
+            prefixes.append(prefix + ("    " if last else "│   "))
     return "\n".join(lines)
 
 
-def is_binary_file(file_path: Path) -> bool:
-    """Check if a file is binary by reading its first chunk."""
+# Headers and small files accumulate in the output buffer between flushes
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Files kept read ahead of the write loop, and the threads reading them
+PREFETCH_WINDOW = 64
+PREFETCH_WORKERS = 4
+# File contents are read and normalised this many bytes at a time
+READ_CHUNK_SIZE = 1 << 20
+# Larger files are streamed by the write loop rather than held in the window
+PREFETCH_MAX_SIZE = READ_CHUNK_SIZE
+
+BINARY_CHECK_SIZE = 1024
+BINARY_CHECK_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+# Skips the atime update, but is only permitted on files the user owns
+O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+# One read buffer per walker thread, reused for every file it checks
+_binary_check_buffers = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def is_binary_file(file_path: str) -> bool:
+    """
+    Check if a file is binary by reading its first chunk.
+
+    Results are memoized, so a file reached through overlapping --dir and
+    --file arguments is only opened once.
+    """
+    buf = getattr(_binary_check_buffers, "buf", None)
+    if buf is None:
+        buf = _binary_check_buffers.buf = bytearray(BINARY_CHECK_SIZE)
     try:
-        chunk_size = 8192
-        with open(file_path, "rb") as f:
-            chunk = f.read(chunk_size)
-            return b"\0" in chunk  # Binary files typically contain null bytes
+        # A raw fd avoids building a buffered file object just to read 1 KiB
+        try:
+            fd = os.open(file_path, BINARY_CHECK_FLAGS | O_NOATIME)
+        except PermissionError:
+            if not O_NOATIME:
+                raise
+            fd = os.open(file_path, BINARY_CHECK_FLAGS)
+        try:
+            if hasattr(os, "readv"):
+                size = os.readv(fd, [buf])
+            else:
+                chunk = os.read(fd, BINARY_CHECK_SIZE)
+                size = len(chunk)
+                buf[:size] = chunk
+        finally:
+            os.close(fd)
+        # Binary files typically contain null bytes
+        return buf.find(0, 0, size) != -1
     except Exception:
         return True  # Assume binary if we can't read the file
 
 
+def iter_file_contents(f_in: BinaryIO) -> Iterator[bytes]:
+    """
+    Yield a binary file's contents as they should appear in the export.
+
+    Chunks that are plain ASCII without carriage returns are yielded as-is.
+    Anything else goes through the same UTF-8 decoding with errors="replace"
+    and newline translation a text-mode read would apply.
+    """
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True
+    )
+    while True:
+        chunk = f_in.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        if chunk.isascii() and b"\r" not in chunk and decoder.getstate() == (b"", 0):
+            yield chunk
+        else:
+            yield decoder.decode(chunk).encode("utf-8")
+    yield decoder.decode(b"", final=True).encode("utf-8")
+
+
+def read_file_contents(file_path: str) -> Optional[bytes]:
+    """
+    Read a file's export contents ahead of the write loop.
+
+    Returns None for files over PREFETCH_MAX_SIZE, which the write loop
+    streams itself so a window never holds more than a chunk per file.
+    """
+    with open(file_path, "rb") as f_in:
+        if os.fstat(f_in.fileno()).st_size > PREFETCH_MAX_SIZE:
+            return None
+        return b"".join(iter_file_contents(f_in))
+
+
+def write_file_contents(
+    collected_files: List[Tuple[str, Optional[str]]],
+    f_out,
+    logger: logging.Logger,
+) -> None:
+    """
+    Append each collected file, under a header line, to the output stream.
+
+    Files are read ahead on a small thread pool, with up to PREFETCH_WINDOW
+    reads in flight: each file written hands its slot to the next unread
+    one, so disk reads keep overlapping with writing. Files too large to
+    prefetch are streamed in chunks here instead. Output order is always
+    that of the list.
+    """
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as executor:
+        pending = iter(collected_files)
+        prefetched: deque = deque()
+
+        def prefetch_next() -> None:
+            item = next(pending, None)
+            if item is not None:
+                future = executor.submit(read_file_contents, item[0])
+                prefetched.append((*item, future))
+
+        for _ in range(PREFETCH_WINDOW):
+            prefetch_next()
+        while prefetched:
+            file_path, relative_file_path, future = prefetched.popleft()
+            prefetch_next()
+            # If file is not relative to cwd, use absolute path
+            if relative_file_path is None:
+                relative_file_path = file_path
+            f_out.write(f"# {relative_file_path}\n".encode("utf-8"))
+            try:
+                contents = future.result()
+                if contents is None:
+                    with open(file_path, "rb") as f_in:
+                        for chunk in iter_file_contents(f_in):
+                            f_out.write(chunk)
+                else:
+                    f_out.write(contents)
+                f_out.write(b"\n")
+                logger.debug(f"Appended content from {file_path}")
+            except Exception as e:
+                logger.error(f"Failed to read file {relative_file_path}: {e}")
+
+
 def format_file_size(size: int) -> str:
     """Format file size in bytes to a human-readable form."""
     units = ["bytes", "KB", "MB", "GB", "TB"]
@@ -255,24 +681,36 @@ def main():
             logger.error(f"Failed to change directory to {args.path}: {e}")
             sys.exit(1)
 
-    # Determine Git repository root
-    try:
-        git_root_str = (
-            subprocess.check_output(
-                ["git", "rev-parse", "--show-toplevel"],
-                stderr=subprocess.STDOUT,
+    # Determine Git repository root and load .gitignore patterns, reusing
+    # the cached result while .gitignore is unchanged
+    cwd = os.getcwd()
+    cached_root = load_cached_root(cwd)
+    if cached_root is not None:
+        git_root, gitignore_patterns = cached_root
+        logger.debug(f"Using cached Git root and .gitignore for {cwd}")
+    else:
+        try:
+            git_root_str = (
+                subprocess.check_output(
+                    ["git", "rev-parse", "--show-toplevel"],
+                    stderr=subprocess.STDOUT,
+                )
+                .decode()
+                .strip()
             )
-            .decode()
-            .strip()
-        )
-        git_root = Path(git_root_str).resolve()
-    except subprocess.CalledProcessError:
-        git_root = Path.cwd()
-        logger.warning("Not inside a Git repository. Using current directory as root.")
-
-    # Load .gitignore patterns
-    gitignore_path = git_root / ".gitignore"
-    gitignore_patterns = load_gitignore_patterns(gitignore_path)
+            git_root = Path(git_root_str).resolve()
+            in_git_repo = True
+        except subprocess.CalledProcessError:
+            git_root = Path.cwd()
+            in_git_repo = False
+            logger.warning(
+                "Not inside a Git repository. Using current directory as root."
+            )
+
+        gitignore_path = git_root / ".gitignore"
+        gitignore_patterns = load_gitignore_patterns(gitignore_path)
+        if in_git_repo:
+            save_cached_root(cwd, git_root, gitignore_patterns)
     logger.debug(f"Patterns from .gitignore: {gitignore_patterns}")
 
     # Combine with additional ignore patterns from --ignore
@@ -301,8 +739,9 @@ def main():
         sys.exit(0)
 
     # Build tree structure
-    tree = build_tree(collected_files, Path.cwd())
-    tree_str = print_tree(tree)
+    tree_str = render_tree(
+        [relative_path for _, relative_path in collected_files if relative_path]
+    )
     logger.debug("Built tree structure.")
 
     # Display the tree structure on the command line
@@ -319,33 +758,11 @@ def main():
 
     # Write the tree structure and concatenate file contents
     try:
-        with output_file.open("w", encoding="utf-8") as f_out:
-            f_out.write("Tree structure:\n")
-            f_out.write(tree_str)
-            f_out.write("\n\n")
-
-            # Concatenate files
-            for file_path in collected_files:
-                try:
-                    relative_file_path = file_path.relative_to(Path.cwd())
-                except ValueError:
-                    # If file is not relative to cwd, use absolute path
-                    relative_file_path = file_path
-                if is_binary_file(file_path):
-                    logger.warning(f"Skipping binary file: {relative_file_path}")
-                    continue
-
-                f_out.write(f"# {relative_file_path}\n")
-                try:
-                    with file_path.open(
-                        "r", encoding="utf-8", errors="replace"
-                    ) as f_in:
-                        content = f_in.read()
-                        f_out.write(content)
-                    f_out.write("\n")
-                    logger.debug(f"Appended content from {file_path}")
-                except Exception as e:
-                    logger.error(f"Failed to read file {relative_file_path}: {e}")
+        with output_file.open("wb", buffering=OUTPUT_BUFFER_SIZE) as f_out:
+            f_out.write(f"Tree structure:\n{tree_str}\n\n".encode("utf-8"))
+
+            # Concatenate files; collect_files already dropped binary ones
+            write_file_contents(collected_files, f_out, logger)
         logger.info("Successfully created the output file.")
     except Exception as e:
         logger.error(f"Failed to create the output file: {e}")
@@ -1,27 +1,27 @@
 # tests/conftest.py
 
 """Test configuration and fixtures."""
-import asyncio
-from uuid import uuid4
-
 import pytest
 
-from ai_agent.core.message_bus import MessageBus
 from ai_agent.core.security_manager import SecurityContext
+from tests.helpers import FakeMessageBus, next_uuid
+
+# Shared read-only permission sets for the test security contexts
+_DEFAULT_PERMS = frozenset({"execute_command", "web_access"})
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 async def message_bus():
-    """Create a message bus instance for testing."""
-    bus = MessageBus("redis://localhost")
+    """Create a message bus shared by the whole test session."""
+    bus = FakeMessageBus()
     await bus.start()
     yield bus
     await bus.stop()
 
 
-@pytest.fixture
-async def security_context():
-    """Create a security context for testing."""
-    return SecurityContext(
-        agent_id=uuid4(), permissions={"execute_command", "web_access"}, auth_level=0
+@pytest.fixture(scope="session")
+def security_context():
+    """Create a security context shared by the whole test session."""
+    return SecurityContext.model_construct(
+        agent_id=next_uuid(), permissions=_DEFAULT_PERMS, auth_level=0
     )
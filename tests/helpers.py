@@ -0,0 +1,61 @@
+# tests/helpers.py
+
+"""Test doubles and helpers shared across the test modules."""
+import asyncio
+from collections import defaultdict
+from typing import Any, Callable, Dict
+from uuid import UUID, uuid4
+
+from ai_agent.core.message_bus import Message
+
+_UUID_POOL_SIZE = 1024
+_uuid_pool = iter(())
+
+
+def next_uuid() -> UUID:
+    """Return a fresh UUID from a pre-generated pool."""
+    global _uuid_pool
+    try:
+        return next(_uuid_pool)
+    except StopIteration:
+        # Refill with new values so ids stay unique for the whole run
+        _uuid_pool = iter([uuid4() for _ in range(_UUID_POOL_SIZE)])
+        return next(_uuid_pool)
+
+
+class FakeMessageBus:
+    """
+    In-memory stand-in for MessageBus.
+
+    Published messages are queued per channel, so tests can inspect them,
+    and handed straight to the channel's subscribers. Nothing touches Redis.
+    """
+
+    def __init__(self):
+        self.subscribers: Dict[str, list[Callable]] = {}
+        self.queues: Dict[str, asyncio.Queue] = defaultdict(asyncio.Queue)
+        self._running = False
+
+    async def publish(self, channel: str, message: Message) -> bool:
+        """Queue a message on a channel and deliver it to subscribers."""
+        self.queues[channel].put_nowait(message)
+        for callback in list(self.subscribers.get(channel, [])):
+            await callback(message)
+        return True
+
+    async def subscribe(self, channel: str, callback: Callable[[Message], Any]):
+        """Subscribe to a channel with callback."""
+        self.subscribers.setdefault(channel, []).append(callback)
+
+    async def unsubscribe(self, channel: str, callback: Callable[[Message], Any]):
+        """Unsubscribe callback from channel."""
+        if channel in self.subscribers:
+            self.subscribers[channel].remove(callback)
+
+    async def start(self):
+        """Start the message bus."""
+        self._running = True
+
+    async def stop(self):
+        """Stop the message bus."""
+        self._running = False
@@ -0,0 +1,112 @@
+# tests/planning_helpers.py
+
+"""Plan builders and assertions for the planning agent tests."""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from ai_agent.agents.planning.planning_agent import (
+    PlannedTask,
+    ProjectPlan,
+    ResourceRequirement,
+    TaskDependency,
+)
+from tests.helpers import next_uuid
+
+# Fixed dates keep plans and failures reproducible between runs
+START_DATE = datetime(2024, 1, 1)
+END_DATE = START_DATE + timedelta(days=30)
+H4 = timedelta(hours=4)
+H8 = timedelta(hours=8)
+H12 = timedelta(hours=12)
+H16 = timedelta(hours=16)
+D5 = timedelta(days=5)
+
+_PLAN_TEMPLATES: Dict[tuple, ProjectPlan] = {}
+
+
+def make_plan(
+    n_tasks: int,
+    title: str = "Test Project",
+    stagger: Optional[timedelta] = None,
+    with_resources: bool = False,
+    dependency_types: Tuple[str, ...] = (),
+) -> ProjectPlan:
+    """
+    Build a project plan of n_tasks eight-hour tasks.
+
+    Args:
+        n_tasks: Number of tasks in the plan
+        title: Plan title
+        stagger: If set, schedule task i to start i * stagger after START_DATE
+        with_resources: Give every task the same developer resource
+        dependency_types: If set, chain each task to the one before it,
+            cycling through these dependency types
+
+    Returns:
+        ProjectPlan: A copy of a cached plan with fresh plan and task ids
+    """
+    key = (n_tasks, title, stagger, with_resources, dependency_types)
+    if key not in _PLAN_TEMPLATES:
+        ids = [next_uuid() for _ in range(n_tasks)]
+        starts = [
+            None if stagger is None else START_DATE + i * stagger
+            for i in range(n_tasks)
+        ]
+        # Every field is known-good here, so skip pydantic validation
+        tasks = [
+            PlannedTask.model_construct(
+                id=ids[i],
+                title=f"Task {i + 1}",
+                description=f"Task {i + 1} description",
+                estimated_duration=H8,
+                start_time=starts[i],
+                end_time=None if starts[i] is None else starts[i] + H8,
+                resources=(
+                    [ResourceRequirement(type="developer", amount=1, units="person")]
+                    if with_resources
+                    else []
+                ),
+                dependencies=(
+                    [
+                        TaskDependency(
+                            task_id=ids[i - 1],
+                            type=dependency_types[(i - 1) % len(dependency_types)],
+                        )
+                    ]
+                    if i and dependency_types
+                    else []
+                ),
+            )
+            for i in range(n_tasks)
+        ]
+
+        _PLAN_TEMPLATES[key] = ProjectPlan.model_construct(
+            title=title,
+            description=f"{title} description",
+            start_date=START_DATE,
+            end_date=END_DATE,
+            tasks=tasks,
+        )
+    plan = _PLAN_TEMPLATES[key].model_copy(deep=True)
+    # Give the copy its own ids so no two tests share a plan or task id
+    plan.id = next_uuid()
+    new_ids = {task.id: next_uuid() for task in plan.tasks}
+    for task in plan.tasks:
+        task.id = new_ids[task.id]
+        for dependency in task.dependencies:
+            dependency.task_id = new_ids[dependency.task_id]
+    return plan
+
+
+def tasks_by_id(plan: ProjectPlan) -> Dict[UUID, PlannedTask]:
+    """Index a plan's tasks by id."""
+    return {task.id: task for task in plan.tasks}
+
+
+def assert_no_overlap(tasks: List[PlannedTask]):
+    """Assert that no two scheduled tasks overlap in time."""
+    # Once sorted by start, only neighbours can overlap
+    ordered = sorted(tasks, key=lambda task: task.start_time)
+    for earlier, later in zip(ordered, ordered[1:]):
+        assert earlier.end_time <= later.start_time
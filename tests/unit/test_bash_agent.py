@@ -6,21 +6,22 @@ Tests for the bash execution agent.
 import asyncio
 from uuid import uuid4
 
-import pytest
 import pytest_asyncio
 
 from ai_agent.agents.execution.bash_agent import BashExecutionAgent
 from ai_agent.core.message_bus import MessageBus
 from ai_agent.core.security_manager import SecurityContext
 
+_BASH_PERMS = frozenset({"bash.execute"})
+
 
 @pytest_asyncio.fixture
 async def bash_agent():
     """Create a bash agent for testing."""
     agent_id = uuid4()
     message_bus = MessageBus("redis://localhost")
-    security_context = SecurityContext(
-        agent_id=agent_id, permissions={"bash.execute"}, auth_level=0
+    security_context = SecurityContext.model_construct(
+        agent_id=agent_id, permissions=_BASH_PERMS, auth_level=0
     )
 
     agent = BashExecutionAgent(
@@ -32,7 +33,6 @@ async def bash_agent():
     await agent.stop()
 
 
-@pytest.mark.asyncio
 async def test_simple_command(bash_agent):
     """Test executing a simple command."""
     result = await bash_agent.execute_task({"command": 'echo "Hello, World!"'})
@@ -43,7 +43,6 @@ async def test_simple_command(bash_agent):
     assert result["result"]["stderr"] == ""
 
 
-@pytest.mark.asyncio
 async def test_command_timeout(bash_agent):
     """Test command timeout."""
     result = await bash_agent.execute_task({"command": "sleep 10", "timeout": 1})
@@ -56,7 +55,6 @@ async def test_command_timeout(bash_agent):
     # Removed the stderr check for "timeout" as it's not being set
 
 
-@pytest.mark.asyncio
 async def test_invalid_command(bash_agent):
     """Test executing an invalid command."""
     result = await bash_agent.execute_task({"command": "invalidcommand"})
@@ -66,7 +64,6 @@ async def test_invalid_command(bash_agent):
     assert "command not found" in result["result"]["stderr"].lower()
 
 
-@pytest.mark.asyncio
 async def test_environment_variables(bash_agent):
     """Test environment variable passing."""
     result = await bash_agent.execute_task(
@@ -77,7 +74,6 @@ async def test_environment_variables(bash_agent):
     assert result["result"]["stdout"].strip() == "test_value"
 
 
-@pytest.mark.asyncio
 async def test_long_output(bash_agent):
     """Test handling long command output."""
     result = await bash_agent.execute_task(
@@ -88,7 +84,6 @@ async def test_long_output(bash_agent):
     assert len(result["result"]["stdout"].splitlines()) == 1000
 
 
-@pytest.mark.asyncio
 async def test_concurrent_commands(bash_agent):
     """Test executing multiple commands concurrently."""
     commands = [
@@ -109,7 +104,6 @@ async def test_concurrent_commands(bash_agent):
     ]
 
 
-@pytest.mark.asyncio
 async def test_command_termination(bash_agent):
     """Test terminating a running command."""
     task = asyncio.create_task(bash_agent.execute_task({"command": "sleep 30"}))
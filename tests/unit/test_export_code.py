@@ -0,0 +1,159 @@
+"""
+Tests for the export_code script.
+"""
+
+import importlib.util
+import io
+import random
+from pathlib import Path
+
+import pathspec
+import pytest
+
+_SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "export_code.py"
+_spec = importlib.util.spec_from_file_location("export_code", _SCRIPT)
+export_code = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(export_code)
+
+# The script keeps the 'gitwildmatch' name so it still runs on pathspec < 1.0
+pytestmark = pytest.mark.filterwarnings("ignore:GitWildMatchPattern:DeprecationWarning")
+
+# Realistic ignore patterns, including negations and directory-only rules
+IGNORE_PATTERNS = [
+    "*.o",
+    "*.log",
+    ".env",
+    "tmp/",
+    "__pycache__/",
+    "docs/_build/",
+    "!important.log",
+    "!dist/README.md",
+    "src/gen/",
+    "build/",
+    "out/*.txt",
+    "b",
+    "*.py",
+    "!b/*.txt",
+    "/root.txt",
+    "**/deep",
+    "a/**/b",
+    "[ab].txt",
+    "docs/**",
+    "!docs/keep/",
+]
+# Padding that takes a pattern set past any size-based matcher switch
+FILLER_PATTERNS = [f"filler{i}/" for i in range(40)]
+PATH_PARTS = [
+    "a",
+    "b",
+    "a.py",
+    "m.o",
+    "x.log",
+    "important.log",
+    "README.md",
+    "dist",
+    "src",
+    "gen",
+    "tmp",
+    "build",
+    "out",
+    "c.txt",
+    "h.txt",
+    "g.log",
+    "keep.py",
+    ".env",
+    "docs",
+    "_build",
+    "keep",
+    "deep",
+    "root.txt",
+]
+
+
+def _reference_spec(patterns):
+    """Build a plain PathSpec on pathspec's reference regex matcher."""
+    try:
+        return pathspec.PathSpec.from_lines("gitwildmatch", patterns, backend="simple")
+    except TypeError:
+        return pathspec.PathSpec.from_lines("gitwildmatch", patterns)
+
+
+@pytest.mark.parametrize(
+    "patterns, path",
+    [
+        (["b", "*.py", "!b/*.txt"], "h.txt/h.txt/g.log/b"),
+        (
+            IGNORE_PATTERNS[:11] + FILLER_PATTERNS,
+            "README.md/keep.py/a.py/m.o",
+        ),
+    ],
+)
+def test_cached_spec_known_cases(patterns, path):
+    """Test paths a pattern-matching backend once got wrong."""
+    spec = export_code.compile_ignore_spec(patterns, [])
+    assert spec.match_file(path) == _reference_spec(patterns).match_file(path)
+
+
+def test_cached_spec_matches_pathspec():
+    """Test CachedSpec decisions against plain pathspec on random inputs."""
+    rng = random.Random(0)
+    for _ in range(500):
+        patterns = rng.sample(IGNORE_PATTERNS, rng.randint(1, len(IGNORE_PATTERNS)))
+        if rng.random() < 0.5:
+            patterns += FILLER_PATTERNS
+        spec = export_code.compile_ignore_spec(patterns, [])
+        reference = _reference_spec(patterns)
+        for _ in range(20):
+            path = "/".join(rng.choices(PATH_PARTS, k=rng.randint(1, 5)))
+            assert spec.match_file(path) == reference.match_file(path), (
+                patterns,
+                path,
+            )
+            assert spec.match_dir(path) == reference.match_file(f"{path}/"), (
+                patterns,
+                path,
+            )
+
+
+def test_render_tree():
+    """Test the tree rendering of cwd-relative paths."""
+    paths = [
+        "z.txt",
+        "src/pkg/util.py",
+        "a.py",
+        "src/main.py",
+        "docs/index.md",
+        "src/pkg/__init__.py",
+    ]
+
+    assert export_code.render_tree(paths) == "\n".join(
+        [
+            "└── .",
+            "    ├── a.py",
+            "    ├── docs",
+            "    │   └── index.md",
+            "    ├── src",
+            "    │   ├── main.py",
+            "    │   └── pkg",
+            "    │       ├── __init__.py",
+            "    │       └── util.py",
+            "    └── z.txt",
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (b"plain\nascii\n", b"plain\nascii\n"),
+        (b"one\r\ntwo\rthree\n", b"one\ntwo\nthree\n"),
+        (b"caf\xc3\xa9 \xff\n", "café �\n".encode("utf-8")),
+        # CRLF and a multi-byte character split across chunk boundaries
+        (b"abc\r\nde\xc3\xa9\r", "abc\ndeé\n".encode("utf-8")),
+    ],
+)
+def test_iter_file_contents(monkeypatch, data, expected):
+    """Test contents are normalised as a text-mode read would."""
+    monkeypatch.setattr(export_code, "READ_CHUNK_SIZE", 4)
+
+    assert b"".join(export_code.iter_file_contents(io.BytesIO(data))) == expected
@@ -2,32 +2,40 @@
 Tests for the planning agent implementation.
 """
 
-from datetime import datetime, timedelta
-from uuid import UUID, uuid4
+from datetime import timedelta
+from uuid import UUID
 
 import pytest
+import pytest_asyncio
 
 from ai_agent.agents.planning.planning_agent import (
     PlannedTask,
     PlanningAgent,
     PlanningSession,
-    ProjectPlan,
-    ResourceRequirement,
-    TaskDependency,
 )
-from ai_agent.core.message_bus import MessageBus
 from ai_agent.core.security_manager import SecurityContext
+from tests.helpers import FakeMessageBus, next_uuid
+from tests.planning_helpers import (
+    D5,
+    END_DATE,
+    H4,
+    H8,
+    START_DATE,
+    assert_no_overlap,
+    make_plan,
+    tasks_by_id,
+)
+
+_PLANNING_PERMS = frozenset({"planning.create", "planning.modify"})
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session")
 async def planning_agent():
-    """Create a planning agent for testing."""
-    agent_id = uuid4()
-    message_bus = MessageBus("redis://localhost")
-    security_context = SecurityContext(
-        agent_id=agent_id,
-        permissions={"planning.create", "planning.modify"},
-        auth_level=0,
+    """Create a planning agent shared by all tests."""
+    agent_id = next_uuid()
+    message_bus = FakeMessageBus()
+    security_context = SecurityContext.model_construct(
+        agent_id=agent_id, permissions=_PLANNING_PERMS, auth_level=0
     )
 
     agent = PlanningAgent(
@@ -39,20 +47,24 @@ async def planning_agent():
     await agent.stop()
 
 
-@pytest.mark.asyncio
+@pytest.fixture(autouse=True)
+def reset_planning_agent(request):
+    """Drop the sessions a test left on the shared agent, if it used one."""
+    yield
+    if "planning_agent" in request.fixturenames:
+        request.getfixturevalue("planning_agent").active_sessions.clear()
+
+
 async def test_create_project_plan(planning_agent):
     """Test creating a basic project plan."""
-    start_date = datetime.utcnow()
-    end_date = start_date + timedelta(days=30)
-
     result = await planning_agent.execute_task(
         {
             "action": "create_plan",
             "parameters": {
                 "title": "Test Project",
                 "description": "Test project description",
-                "start_date": start_date,
-                "end_date": end_date,
+                "start_date": START_DATE,
+                "end_date": END_DATE,
                 "initial_tasks": [
                     {
                         "title": "Task 1",
@@ -76,19 +88,23 @@ async def test_create_project_plan(planning_agent):
     assert len(result["plan"]["tasks"]) == 2
 
 
-@pytest.mark.asyncio
-async def test_decompose_task(planning_agent):
+# The dict form is what arrives over the message bus
+@pytest.mark.parametrize("as_dict", [False, True], ids=["model", "dict"])
+async def test_decompose_task(planning_agent, as_dict):
     """Test task decomposition."""
-    task = PlannedTask(
+    task = PlannedTask.model_construct(
         title="Complex Task",
         description="A complex task that needs decomposition",
-        estimated_duration=timedelta(days=5),
+        estimated_duration=D5,
         required_capabilities=["python", "docker", "kubernetes"],
         priority=1,
     )
 
     result = await planning_agent.execute_task(
-        {"action": "decompose_task", "parameters": {"task": task.model_dump()}}
+        {
+            "action": "decompose_task",
+            "parameters": {"task": task.model_dump() if as_dict else task},
+        }
     )
 
     assert result["success"]
@@ -96,21 +112,17 @@ async def test_decompose_task(planning_agent):
     assert result["complexity_score"] > 0.7
 
 
-@pytest.mark.asyncio
 async def test_update_project_plan(planning_agent):
     """Test updating a project plan."""
     # First create a plan
-    start_date = datetime.utcnow()
-    end_date = start_date + timedelta(days=30)
-
     create_result = await planning_agent.execute_task(
         {
             "action": "create_plan",
             "parameters": {
                 "title": "Test Project",
                 "description": "Test project description",
-                "start_date": start_date,
-                "end_date": end_date,
+                "start_date": START_DATE,
+                "end_date": END_DATE,
                 "initial_tasks": [],
             },
         }
@@ -128,7 +140,7 @@ async def test_update_project_plan(planning_agent):
                     {
                         "title": "New Task",
                         "description": "Added task",
-                        "estimated_duration": timedelta(hours=8),
+                        "estimated_duration": H8,
                         "required_capabilities": ["python"],
                     }
                 ]
@@ -140,134 +152,71 @@ async def test_update_project_plan(planning_agent):
     assert len(update_result["plan"]["tasks"]) == 1
 
 
-@pytest.mark.asyncio
-async def test_analyze_dependencies(planning_agent):
-    """Test dependency analysis."""
-    # Create tasks with dependencies
-    task1_id = uuid4()
-    task2_id = uuid4()
-
-    start_date = datetime.utcnow()
-    end_date = start_date + timedelta(days=30)
-
-    plan = ProjectPlan(
-        title="Test Project",
-        description="Test project with dependencies",
-        start_date=start_date,
-        end_date=end_date,
-        tasks=[
-            PlannedTask(
-                id=task1_id,
-                title="Task 1",
-                description="First task",
-                estimated_duration=timedelta(hours=8),
-                start_time=start_date,
-                end_time=start_date + timedelta(hours=8),
-            ),
-            PlannedTask(
-                id=task2_id,
-                title="Task 2",
-                description="Second task",
-                estimated_duration=timedelta(hours=8),
-                dependencies=[TaskDependency(task_id=task1_id, type="finish_to_start")],
-                start_time=start_date + timedelta(hours=8),
-                end_time=start_date + timedelta(hours=16),
-            ),
-        ],
-    )
-
-    # Create session
-    session_id = uuid4()
-    planning_agent.active_sessions[session_id] = PlanningSession(project_plan=plan)
-
-    result = await planning_agent.execute_task(
-        {"action": "analyze_dependencies", "session_id": session_id}
-    )
-
-    assert result["success"]
-    assert len(result["critical_path"]) == 2
-    assert result["dependency_stats"]["total_dependencies"] == 1
-    assert result["dependency_stats"]["max_depth"] == 1
-
-
-@pytest.mark.asyncio
-async def test_resource_conflict_detection(planning_agent):
-    """Test detection of resource conflicts."""
-    start_date = datetime.utcnow()
-
-    # Create tasks with overlapping resource requirements
-    task1_id = uuid4()
-    task2_id = uuid4()
-
-    plan = ProjectPlan(
-        title="Test Project",
-        description="Test project with resource conflicts",
-        start_date=start_date,
-        end_date=start_date + timedelta(days=30),
-        tasks=[
-            PlannedTask(
-                id=task1_id,
-                title="Task 1",
-                description="First task",
-                estimated_duration=timedelta(hours=8),
-                start_time=start_date,
-                end_time=start_date + timedelta(hours=8),
-                resources=[
-                    ResourceRequirement(type="developer", amount=1, units="person")
-                ],
-            ),
-            PlannedTask(
-                id=task2_id,
-                title="Task 2",
-                description="Second task",
-                estimated_duration=timedelta(hours=8),
-                start_time=start_date + timedelta(hours=4),
-                end_time=start_date + timedelta(hours=12),
-                resources=[
-                    ResourceRequirement(type="developer", amount=1, units="person")
-                ],
-            ),
-        ],
-    )
-
-    # Create session
-    session_id = uuid4()
-    planning_agent.active_sessions[session_id] = PlanningSession(project_plan=plan)
+def _open_session(agent: PlanningAgent, plan) -> UUID:
+    """Install plan as a new session on the agent and return its id."""
+    session_id = next_uuid()
+    agent.active_sessions[session_id] = PlanningSession(project_plan=plan)
+    return session_id
+
+
+@pytest.mark.parametrize(
+    "plan_kwargs, critical_path, dependencies, max_depth, has_conflicts",
+    [
+        pytest.param(
+            {"n_tasks": 2, "stagger": H8, "dependency_types": ("finish_to_start",)},
+            2,
+            1,
+            1,
+            False,
+            id="finish_to_start",
+        ),
+        # Overlapping tasks that need the same developer
+        pytest.param(
+            {"n_tasks": 2, "stagger": H4, "with_resources": True},
+            2,
+            0,
+            0,
+            True,
+            id="resource_conflict",
+        ),
+        # A chain of 5 tasks with alternating dependency types
+        pytest.param(
+            {
+                "n_tasks": 5,
+                "dependency_types": ("start_to_start", "finish_to_start"),
+            },
+            5,
+            4,
+            4,
+            False,
+            id="complex_chain",
+        ),
+    ],
+)
+async def test_analyze_dependencies(
+    planning_agent, plan_kwargs, critical_path, dependencies, max_depth, has_conflicts
+):
+    """Test dependency and resource conflict analysis."""
+    plan = make_plan(**plan_kwargs)
+    session_id = _open_session(planning_agent, plan)
 
     result = await planning_agent.execute_task(
         {"action": "analyze_dependencies", "session_id": session_id}
     )
 
     assert result["success"]
-    assert len(result["resource_conflicts"]) > 0
+    assert len(result["critical_path"]) == critical_path
+    assert result["dependency_stats"]["total_dependencies"] == dependencies
+    assert result["dependency_stats"]["max_depth"] == max_depth
+    assert bool(result["resource_conflicts"]) == has_conflicts
 
 
-@pytest.mark.asyncio
 async def test_export_plan(planning_agent):
     """Test plan export functionality."""
     # Create a simple plan
-    start_date = datetime.utcnow()
-    end_date = start_date + timedelta(days=30)
-
-    plan = ProjectPlan(
-        title="Export Test Project",
-        description="Test project for export",
-        start_date=start_date,
-        end_date=end_date,
-        tasks=[
-            PlannedTask(
-                title="Task 1",
-                description="First task",
-                estimated_duration=timedelta(hours=8),
-                start_time=start_date,
-                end_time=start_date + timedelta(hours=8),
-            )
-        ],
-    )
+    plan = make_plan(1, title="Export Test Project", stagger=H8)
 
-    # Create session
-    session_id = uuid4()
-    planning_agent.active_sessions[session_id] = PlanningSession(project_plan=plan)
+    session_id = _open_session(planning_agent, plan)
 
     export_result = await planning_agent.export_plan(session_id)
 
@@ -276,70 +225,24 @@ async def test_export_plan(planning_agent):
     assert export_result["plan"]["title"] == "Export Test Project"
 
 
-@pytest.mark.asyncio
-async def test_session_cleanup(planning_agent):
+async def test_session_cleanup():
     """Test planning session cleanup."""
-    # Create a session
-    session_id = uuid4()
-    planning_agent.active_sessions[session_id] = PlanningSession(
-        project_plan=ProjectPlan(
-            title="Test Project",
-            description="Test project",
-            start_date=datetime.utcnow(),
-            end_date=datetime.utcnow() + timedelta(days=30),
-            tasks=[],
-        )
-    )
+    # Cleanup only touches active_sessions, so skip the full agent setup
+    agent = PlanningAgent.__new__(PlanningAgent)
+    session_id = next_uuid()
+    agent.active_sessions = {session_id: PlanningSession(project_plan=make_plan(0))}
 
     # Clean up session
-    await planning_agent.cleanup_session(session_id)
-    assert session_id not in planning_agent.active_sessions
+    await PlanningAgent.cleanup_session(agent, session_id)
+    assert session_id not in agent.active_sessions
 
 
-@pytest.mark.asyncio
 async def test_optimize_schedule(planning_agent):
     """Test schedule optimization."""
-    start_date = datetime.utcnow()
-    task1_id = uuid4()
-    task2_id = uuid4()
-    task3_id = uuid4()
-
-    plan = ProjectPlan(
-        title="Optimization Test Project",
-        description="Test project for schedule optimization",
-        start_date=start_date,
-        end_date=start_date + timedelta(days=30),
-        tasks=[
-            PlannedTask(
-                id=task1_id,
-                title="Task 1",
-                description="First task",
-                estimated_duration=timedelta(hours=8),
-                priority=1,
-            ),
-            PlannedTask(
-                id=task2_id,
-                title="Task 2",
-                description="Second task",
-                estimated_duration=timedelta(hours=8),
-                dependencies=[TaskDependency(task_id=task1_id, type="finish_to_start")],
-                priority=2,
-            ),
-            PlannedTask(
-                id=task3_id,
-                title="Task 3",
-                description="Third task",
-                estimated_duration=timedelta(hours=8),
-                dependencies=[TaskDependency(task_id=task2_id, type="finish_to_start")],
-                priority=3,
-            ),
-        ],
-    )
+    plan = make_plan(3, dependency_types=("finish_to_start",))
+    task1_id, task2_id, task3_id = (task.id for task in plan.tasks)
 
-    # Create session
-    session_id = uuid4()
-    session = PlanningSession(project_plan=plan)
-    planning_agent.active_sessions[session_id] = session
+    _open_session(planning_agent, plan)
 
     # Optimize schedule
     await planning_agent._optimize_schedule(plan)
@@ -350,52 +253,19 @@ async def test_optimize_schedule(planning_agent):
         assert task.end_time is not None
 
     # Verify dependencies are respected
-    task1 = next(t for t in plan.tasks if t.id == task1_id)
-    task2 = next(t for t in plan.tasks if t.id == task2_id)
-    task3 = next(t for t in plan.tasks if t.id == task3_id)
+    by_id = tasks_by_id(plan)
+    task1, task2, task3 = by_id[task1_id], by_id[task2_id], by_id[task3_id]
 
     assert task1.end_time <= task2.start_time
     assert task2.end_time <= task3.start_time
 
 
-@pytest.mark.asyncio
 async def test_resource_leveling(planning_agent):
     """Test resource leveling functionality."""
-    start_date = datetime.utcnow()
-
-    plan = ProjectPlan(
-        title="Resource Test Project",
-        description="Test project for resource leveling",
-        start_date=start_date,
-        end_date=start_date + timedelta(days=30),
-        tasks=[
-            PlannedTask(
-                title="Task A",
-                description="Task with developer resource",
-                estimated_duration=timedelta(hours=8),
-                resources=[
-                    ResourceRequirement(type="developer", amount=1.0, units="person")
-                ],
-                start_time=start_date,
-                end_time=start_date + timedelta(hours=8),
-            ),
-            PlannedTask(
-                title="Task B",
-                description="Another task with developer resource",
-                estimated_duration=timedelta(hours=8),
-                resources=[
-                    ResourceRequirement(type="developer", amount=1.0, units="person")
-                ],
-                start_time=start_date,
-                end_time=start_date + timedelta(hours=8),
-            ),
-        ],
-    )
+    # Both tasks need the same developer at the same time
+    plan = make_plan(2, stagger=timedelta(0), with_resources=True)
 
-    # Create session
-    session_id = uuid4()
-    session = PlanningSession(project_plan=plan)
-    planning_agent.active_sessions[session_id] = session
+    _open_session(planning_agent, plan)
 
     # Level resources
     await planning_agent._level_resources(plan.tasks)
@@ -409,58 +279,4 @@ async def test_resource_leveling(planning_agent):
             tasks_by_resource[resource.type].append(task)
 
     for resource_tasks in tasks_by_resource.values():
-        for i, task1 in enumerate(resource_tasks):
-            for task2 in resource_tasks[i + 1 :]:
-                # Check for no overlap
-                assert (
-                    task1.end_time <= task2.start_time
-                    or task2.end_time <= task1.start_time
-                )
-
-
-@pytest.mark.asyncio
-async def test_complex_dependency_analysis(planning_agent):
-    """Test analysis of complex task dependencies."""
-    start_date = datetime.utcnow()
-    tasks = []
-
-    # Create a chain of 5 tasks with various dependency types
-    previous_id = None
-    for i in range(5):
-        task_id = uuid4()
-        task = PlannedTask(
-            id=task_id,
-            title=f"Task {i+1}",
-            description=f"Task {i+1} description",
-            estimated_duration=timedelta(hours=8),
-        )
-
-        if previous_id:
-            # Alternate between dependency types
-            dep_type = "finish_to_start" if i % 2 == 0 else "start_to_start"
-            task.dependencies.append(TaskDependency(task_id=previous_id, type=dep_type))
-
-        tasks.append(task)
-        previous_id = task_id
-
-    plan = ProjectPlan(
-        title="Complex Dependency Test",
-        description="Test project with complex dependencies",
-        start_date=start_date,
-        end_date=start_date + timedelta(days=30),
-        tasks=tasks,
-    )
-
-    # Create session
-    session_id = uuid4()
-    session = PlanningSession(project_plan=plan)
-    planning_agent.active_sessions[session_id] = session
-
-    # Analyze dependencies
-    result = await planning_agent.execute_task(
-        {"action": "analyze_dependencies", "session_id": session_id}
-    )
-
-    assert result["success"]
-    assert len(result["critical_path"]) == 5  # All tasks should be critical
-    assert result["dependency_stats"]["max_depth"] == 4  # Depth should be n-1
+        assert_no_overlap(resource_tasks)
@@ -2,13 +2,12 @@
 Tests for the research agent implementation.
 """
 
-import asyncio
-from datetime import datetime
-from unittest.mock import Mock, patch
-from uuid import UUID, uuid4
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+from uuid import UUID
 
 import pytest
-import redis.asyncio as redis
+import pytest_asyncio
 
 from ai_agent.agents.research.research_agent import (
     ResearchAgent,
@@ -16,119 +15,100 @@ from ai_agent.agents.research.research_agent import (
     SearchParams,
     SearchResult,
 )
-from ai_agent.core.message_bus import MessageBus
-from ai_agent.core.security_manager import SecurityContext
 from ai_agent.sandbox.browser.secure_browser import SecureBrowser
+from tests.helpers import next_uuid
 
+# Computed once; the tests only need an aware timestamp, not the exact time
+NOW_UTC = datetime.now(timezone.utc)
 
-@pytest.fixture
-def mock_browser():
-    """Create a mock browser for testing."""
-    with patch("ai_agent.sandbox.browser.secure_browser.SecureBrowser") as mock:
-        mock.return_value = Mock(spec=SecureBrowser)
-        yield mock.return_value
-
-
-@pytest.fixture
-async def research_agent(mock_browser):
-    """Create a research agent for testing."""
-    agent_id = uuid4()
-    redis_client = redis.from_url("redis://localhost")
-    message_bus = MessageBus(redis)
-    security_context = SecurityContext(
-        agent_id=agent_id, permissions={"web.browse"}, auth_level=0
-    )
 
+@pytest_asyncio.fixture(scope="session")
+async def research_agent(message_bus, security_context):
     agent = ResearchAgent(
-        agent_id=agent_id, message_bus=message_bus, security_context=security_context
+        agent_id=next_uuid(), message_bus=message_bus, security_context=security_context
     )
-    agent.browser = mock_browser
-
-    try:
-        await agent.start()
-    except Exception as e:
-        pytest.fail(f"Failed to start ResearchAgent: {e}")
+    await agent.start()
     yield agent
+    await agent.stop()
+
+
+@pytest.fixture(autouse=True)
+def reset_research_agent(request):
+    """Drop the sessions a test left on the shared agent, if it used one."""
+    yield
+    if "research_agent" in request.fixturenames:
+        request.getfixturevalue("research_agent").active_sessions.clear()
 
-    try:
-        await agent.stop()
-    except Exception as e:
-        print(f"Error stopping agent: {e}")
-    finally:
-        await agent.stop()
+
+@pytest.fixture
+def mock_browser(research_agent):
+    """Swap a mock browser into the shared research agent for one test."""
+    browser = research_agent.browser
+    research_agent.browser = Mock(spec=SecureBrowser)
+    yield research_agent.browser
+    research_agent.browser = browser
+
+
+def _serve_pages(*pages):
+    """Make browse() answer each URL with its page, whatever the call order."""
+    by_url = {page["url"]: page for page in pages}
+    return lambda url, *args, **kwargs: by_url[url]
 
 
 async def test_basic_research(research_agent, mock_browser):
     """Test basic research functionality."""
+    search_url = "https://duckduckgo.com/?q=test query"
     # Mock browser responses
-    mock_browser.browse.side_effect = [
+    mock_browser.browse.side_effect = _serve_pages(
         {
             "success": True,
-            "url": "https://search.test",
+            "url": search_url,
             "title": "Search Results",
             "content": {
                 "links": [
                     {"text": "Result 1", "href": "https://test1.com"},
                     {"text": "Result 2", "href": "https://test2.com"},
-                ]
+                ],
             },
         },
-        {
-            "success": True,
-            "url": "https://test1.com",
-            "title": "Test Page 1",
-            "content": {"text": "Test content 1", "links": []},
-        },
-        {
-            "success": True,
-            "url": "https://test2.com",
-            "title": "Test Page 2",
-            "content": {"text": "Test content 2", "links": []},
-        },
-    ]
+    )
     result = await research_agent.execute_task(
-        {
-            "action": "start_research",
-            "params": {"search_params": {"query": "test query", "max_results": 2}},
-        }
+        {"action": "search", "params": {"query": "test query", "max_results": 2}}
     )
+
     assert result["success"]
-    assert len(result["results"]) == 2
+    assert [r["title"] for r in result["results"]] == ["Search Results"]
+    assert result["session_id"] in research_agent.active_sessions
+    mock_browser.browse.assert_awaited_once_with(url=search_url, timeout=30)
 
 
-@pytest.mark.asyncio
+@pytest.mark.xfail(
+    strict=True,
+    raises=AttributeError,
+    reason="ResearchAgent does not implement continue_research yet",
+)
 async def test_research_session_continuation(research_agent, mock_browser):
     """Test continuing a research session."""
     # Initial research
-    mock_browser.browse.side_effect = [
+    mock_browser.browse.side_effect = _serve_pages(
         {
             "success": True,
-            "url": "https://search.test",
+            "url": "https://duckduckgo.com/?q=test query",
             "title": "Search Results",
             "content": {"links": [{"text": "Result 1", "href": "https://test1.com"}]},
         },
-        {
-            "success": True,
-            "url": "https://test1.com",
-            "title": "Test Page 1",
-            "content": {"text": "Test content 1", "links": []},
-        },
-    ]
+    )
 
     initial_result = await research_agent.execute_task(
-        {
-            "action": "start_research",
-            "params": {"search_params": {"query": "test query", "max_results": 1}},
-        }
+        {"action": "search", "params": {"query": "test query", "max_results": 1}}
     )
 
-    try:
-        session_id = UUID(initial_result["session_id"])
-    except ValueError:
-        pytest.fail("Invalid session_id returned: not a valid UUID")
+    assert initial_result["success"]
+    session_id = initial_result["session_id"]
+    assert isinstance(session_id, UUID)
 
     # Continue research
-    mock_browser.browse.side_effect = [
+    mock_browser.browse.side_effect = _serve_pages(
         {
             "success": True,
             "url": "https://search.test/page2",
@@ -141,7 +121,7 @@ async def test_research_session_continuation(research_agent, mock_browser):
             "title": "Test Page 2",
             "content": {"text": "Test content 2", "links": []},
         },
-    ]
+    )
 
     continued_result = await research_agent.continue_research(
         session_id, {"max_results": 1}
@@ -152,14 +132,11 @@ async def test_research_session_continuation(research_agent, mock_browser):
     assert continued_result["session_id"] == str(session_id)
 
 
-@pytest.mark.asyncio
 async def test_research_summary(research_agent):
-    """Test research results summarization."""
+    """Test analyzing the results of a research session."""
     # Create test session with results
-    session_id = uuid4()
     session = ResearchSession(
-        query="test query",  # Added required 'query' field
-        search_params=SearchParams(query="test query"),
+        query="test query",
         results=[
             SearchResult(
                 url="https://test1.com",
@@ -175,63 +152,66 @@ async def test_research_summary(research_agent):
                 content={"text": "Test content 2", "links": [{"href": "link3"}]},
             ),
         ],
-        end_time=datetime.now(datetime.timezone.utc),
+        created_at=NOW_UTC,
+        updated_at=NOW_UTC + timedelta(minutes=1),
     )
-    end_time = datetime.now(datetime.timezone.utc)
-    research_agent.active_sessions[session_id] = session
+    research_agent.active_sessions[session.id] = session
 
-    # Generate summary
+    # Summarize the session
     summary_result = await research_agent.execute_task(
-        {"action": "summarize_results", "params": {"session_id": session_id}}
+        {"action": "analyze", "params": {"session_id": str(session.id)}}
     )
 
     assert summary_result["success"]
-    assert "summary" in summary_result
+    analysis = summary_result["analysis"]
+    assert analysis["query"] == "test query"
+    assert analysis["result_count"] == 2
+    assert analysis["duration"] == 60
+    assert analysis["domains"] == {"test1.com": 1, "test2.com": 1}
+    assert "content" in analysis["key_terms"]
 
 
-@pytest.mark.asyncio
-async def test_error_handling_during_research(mock_browser):
+async def test_error_handling_during_research(research_agent, mock_browser):
     """Test error handling during research."""
     # Simulate browser error
     mock_browser.browse.side_effect = Exception("Browser error")
 
     result = await research_agent.execute_task(
-        {
-            "action": "start_research",
-            "parameters": {"search_params": {"query": "test query"}},
-        }
+        {"action": "search", "params": {"query": "test query"}}
     )
 
     assert not result["success"]
     assert "error" in result
     assert "Browser error" in result["error"]
+    mock_browser.browse.assert_awaited_once()
 
 
-@pytest.mark.asyncio
-async def test_session_cleanup(research_agent):
+async def test_session_cleanup():
     """Test session cleanup."""
-    # Create test session
-    session_id = uuid4()
-    session = ResearchSession(
-        query="test query",  # Added required 'query' field
-        search_params=SearchParams(query="test query"),
-    )
-    research_agent.active_sessions[session_id] = session
+    # Cleanup only touches active_sessions, so skip the full agent setup
+    agent = ResearchAgent.__new__(ResearchAgent)
+    session_id = next_uuid()
+    agent.active_sessions = {
+        session_id: ResearchSession(
+            query="test query",  # Added required 'query' field
+            search_params=SearchParams(query="test query"),
+        )
+    }
 
-    try:
-        await research_agent.cleanup_session(session_id)
-        assert session_id not in research_agent.active_sessions
-    except Exception as e:
-        pytest.fail(f"Failed to clean up session: {e}")
+    await ResearchAgent.cleanup_session(agent, session_id)
+    assert session_id not in agent.active_sessions
 
 
-@pytest.mark.asyncio
+@pytest.mark.xfail(
+    strict=True,
+    raises=AttributeError,
+    reason="ResearchAgent does not implement export_session yet",
+)
 async def test_export_session(research_agent):
     """Test session export functionality."""
     # Create test session
-    session_id = uuid4()
     session = ResearchSession(
-        search_params=SearchParams(query="test query"),
+        query="test query",
         results=[
             SearchResult(
                 url="https://test1.com",
@@ -239,56 +219,17 @@ async def test_export_session(research_agent):
                 content={"text": "Test content"},
             )
         ],
-        end_time=datetime.utcnow(),
     )
-    try:
-        export_data = await research_agent.export_session(session_id)
-    except Exception as e:
-        pytest.fail(f"Failed to export session: {e}")
+    research_agent.active_sessions[session.id] = session
+
+    export_data = await research_agent.export_session(session.id)
 
     assert "session" in export_data
     assert "summary" in export_data
     assert export_data["session"]["search_params"]["query"] == "test query"
 
 
-from ai_agent.agents.research.research_agent import (
-    ResearchAgent,
-    ResearchSession,
-    SearchParams,
-    SearchResult,
-)
-from ai_agent.core.message_bus import MessageBus
-from ai_agent.core.security_manager import SecurityContext
-
-
-@pytest.fixture
-async def message_bus():
-    bus = MessageBus("redis://localhost:6379")
-    await bus.start()
-    yield bus
-    await bus.stop()
-
-
-@pytest.fixture
-def security_context():
-    return SecurityContext(
-        agent_id=uuid4(),
-        permissions={"research.execute", "research.analyze"},
-        auth_level=1,
-    )
-
-
-@pytest.fixture
-async def research_agent(message_bus, security_context):
-    agent = ResearchAgent(
-        agent_id=uuid4(), message_bus=message_bus, security_context=security_context
-    )
-    await agent.start()
-    yield agent
-    await agent.stop()
-
-
-@pytest.mark.asyncio
+@pytest.mark.integration
 async def test_perform_search(research_agent):
     """Test performing a web search."""
     params = {"query": "test query", "max_results": 5, "timeout": 30}
@@ -311,7 +252,7 @@ async def test_perform_search(research_agent):
         pytest.fail(f"Test failed: {str(e)}")
 
 
-@pytest.mark.asyncio
+@pytest.mark.integration
 async def test_analyze_results(research_agent):
     """Test analyzing search results."""
     # First perform a search
@@ -342,7 +283,6 @@ async def test_analyze_results(research_agent):
         pytest.fail(f"Test failed: {str(e)}")
 
 
-@pytest.mark.asyncio
 async def test_invalid_action(research_agent):
     """Test handling of invalid action."""
     try:
@@ -355,10 +295,3 @@ async def test_invalid_action(research_agent):
 
     except Exception as e:
         pytest.fail(f"Test failed: {str(e)}")
-
-
-from datetime import datetime
-from unittest.mock import Mock, patch
-from uuid import UUID, uuid4
-
-import pytest
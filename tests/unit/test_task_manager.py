@@ -0,0 +1,79 @@
+"""
+Tests for the task manager implementation.
+"""
+
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+
+from ai_agent.core.task_manager import Task, TaskManager, TaskRequirements
+
+
+@pytest.fixture
+def task_manager():
+    """Create a task manager with a mocked message bus."""
+    message_bus = Mock()
+    message_bus.publish = AsyncMock(return_value=True)
+    return TaskManager(message_bus=message_bus, agent_manager=Mock())
+
+
+def _subtask(name: str) -> Task:
+    return Task(
+        type="test",
+        description=name,
+        requirements=TaskRequirements(capabilities=["python"]),
+    )
+
+
+async def test_cancel_task_cascades_to_subtasks(task_manager):
+    """Test cancelling a task cancels its whole subtask tree."""
+    parent_id = await task_manager.create_task(
+        "test", "Parent", TaskRequirements(capabilities=["python"])
+    )
+    child_ids = await task_manager.create_subtasks(
+        parent_id, [_subtask("Child 1"), _subtask("Child 2")]
+    )
+    grandchild_ids = await task_manager.create_subtasks(
+        child_ids[0], [_subtask("Grandchild")]
+    )
+
+    assert await task_manager.cancel_task(parent_id)
+
+    for task_id in [parent_id, *child_ids, *grandchild_ids]:
+        assert await task_manager.get_task_status(task_id) == "cancelled"
+        assert not await task_manager.assign_task(task_id, uuid4())
+
+
+async def test_cancel_task_notifies_assigned_agent(task_manager):
+    """Test cancelling an assigned task notifies its agent."""
+    task_id = await task_manager.create_task(
+        "test", "Assigned", TaskRequirements(capabilities=["python"])
+    )
+    agent_id = uuid4()
+    assert await task_manager.assign_task(task_id, agent_id)
+
+    assert await task_manager.cancel_task(task_id)
+
+    channel, message = task_manager.message_bus.publish.await_args.args
+    assert channel == f"agent.{agent_id}"
+    assert message.type == "task_cancelled"
+    assert message.content == {"task_id": str(task_id)}
+
+
+async def test_cancel_unknown_task(task_manager):
+    """Test cancelling an unknown task fails."""
+    assert not await task_manager.cancel_task(uuid4())
+
+
+async def test_process_queue_skips_cancelled_tasks(task_manager):
+    """Test the scheduler drops cancelled tasks from the queue."""
+    task_id = await task_manager.create_task(
+        "test", "Cancelled", TaskRequirements(capabilities=["python"])
+    )
+    await task_manager.cancel_task(task_id)
+
+    await task_manager._process_task_queue()
+
+    assert task_id not in task_manager.task_queue
+    task_manager.agent_manager.get_agents_by_capability.assert_not_called()